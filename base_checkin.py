@@ -1,11 +1,14 @@
 """
 签到基础接口
-简化的抽象层，只保留核心的checkin方法
+简化的抽象层，子类只需实现账号列表和单账号签到
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Callable, Tuple, Type
 import logging
+import time
+from urllib.parse import urlparse
+from budget import RunBudget
 
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -15,23 +18,95 @@ logger = logging.getLogger(__name__)
 class BaseCheckin(ABC):
     """签到基础类"""
     
-    def __init__(self, name: str):
+    # 无历史记录时单个账号签到的预估耗时（秒），用于调度排序
+    default_cost = 10.0
+    
+    def __init__(self, name: str, url: str = ''):
         self.name = name
+        self.url = url
+        self.host = urlparse(url).netloc
+        self.budget = RunBudget()
         self.logger = logging.getLogger(f"{__name__}.{name}")
     
     @abstractmethod
-    def checkin(self) -> List[Dict[str, Any]]:
+    def get_accounts(self) -> List[Dict[str, Any]]:
         """
-        执行签到操作
+        获取待签到账号列表
         
         Returns:
-            List[Dict[str, Any]]: 签到结果列表，每个结果包含：
+            List[Dict[str, Any]]: 账号列表，每个账号至少包含：
+                - name: str - 账户标识
+        """
+        pass
+    
+    @abstractmethod
+    def checkin_account(self, account: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        单个账号签到
+        
+        Returns:
+            Dict[str, Any]: 签到结果，包含：
                 - success: bool - 是否成功
                 - account: str - 账户标识
                 - message: str - 结果消息
         """
         pass
     
+    def checkin(self) -> List[Dict[str, Any]]:
+        """
+        执行签到操作，预算不足的账号标记为跳过
+        
+        Returns:
+            List[Dict[str, Any]]: 签到结果列表
+        """
+        return [self.run_account(account) for account in self.get_accounts()]
+    
+    def run_account(self, account: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        在运行预算内执行单个账号签到
+        
+        Returns:
+            Dict[str, Any]: 签到结果，额外包含 duration - 耗时（秒）
+        """
+        if not self.budget.can_afford(self.name, self.default_cost):
+            self.logger.warning(f"运行预算不足，跳过账号: {account['name']}")
+            return self.skipped_result(account)
+        
+        start = time.monotonic()
+        result = self.checkin_account(account)
+        result['duration'] = time.monotonic() - start
+        self.budget.record_account(self.name, result['duration'])
+        return result
+    
+    def timed_call(self, func: Callable[[float], Any], default_timeout: float,
+                   timeout_errors: Tuple[Type[BaseException], ...] = (TimeoutError,)) -> Any:
+        """
+        以自适应超时调用 func(timeout)，并把耗时或超时记入运行预算
+        
+        Args:
+            func: 接收超时（秒）的请求函数
+            default_timeout: 该请求原有的固定超时（秒）
+            timeout_errors: 视为超时的异常类型
+        """
+        timeout = self.budget.timeout(self.host, default_timeout)
+        start = time.monotonic()
+        try:
+            result = func(timeout)
+        except timeout_errors:
+            self.budget.record_timeout(self.host, timeout)
+            raise
+        self.budget.record(self.host, time.monotonic() - start)
+        return result
+    
+    def skipped_result(self, account: Dict[str, Any]) -> Dict[str, Any]:
+        """预算不足时的跳过结果"""
+        return {
+            'success': False,
+            'skipped': True,
+            'account': account['name'],
+            'message': '运行预算不足，已跳过'
+        }
+    
     def get_name(self) -> str:
         """获取签到器名称"""
-        return self.name 
\ No newline at end of file
+        return self.name 
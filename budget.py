@@ -0,0 +1,108 @@
+"""
+运行预算模块
+整次运行共享一个截止时间，各签到器和请求从中扣取超时
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+
+class RunBudget:
+    """运行预算：全局截止时间 + 按主机自适应的请求超时"""
+
+    def __init__(self, total_seconds: Optional[float] = None, min_timeout: float = 3.0,
+                 max_timeout: float = 60.0, factor: float = 3.0, alpha: float = 0.3, min_samples: int = 3):
+        """
+        Args:
+            total_seconds: 整次运行的时间预算（秒），None 表示不限制
+            min_timeout: 自适应超时下限（秒）
+            max_timeout: 自适应超时上限（秒）
+            factor: 超时 = 平均延迟 × factor
+            alpha: 指数移动平均的平滑系数
+            min_samples: 样本数达到此值前，超时不低于调用方给出的默认值
+        """
+        self.total_seconds = total_seconds
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.factor = factor
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.started_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._latency: Dict[str, float] = {}
+        self._samples: Dict[str, int] = {}
+        self._backoff: Dict[str, float] = {}
+        self._account_cost: Dict[str, float] = {}
+        self._account_estimate: Dict[str, float] = {}
+
+    def elapsed(self) -> float:
+        """已用时间（秒）"""
+        return time.monotonic() - self.started_at
+
+    def remaining(self) -> float:
+        """剩余时间（秒），不限制时返回无穷大"""
+        if self.total_seconds is None:
+            return float('inf')
+        return max(0.0, self.total_seconds - self.elapsed())
+
+    def expired(self) -> bool:
+        """预算是否已耗尽"""
+        return self.remaining() <= 0
+
+    def _update(self, table: Dict[str, float], key: str, value: float):
+        with self._lock:
+            previous = table.get(key)
+            if previous is None:
+                table[key] = value
+            else:
+                table[key] = self.alpha * value + (1 - self.alpha) * previous
+
+    def record(self, host: str, elapsed: float):
+        """记录一次请求的延迟"""
+        self._update(self._latency, host, elapsed)
+        with self._lock:
+            self._samples[host] = self._samples.get(host, 0) + 1
+
+    def record_timeout(self, host: str, timeout: float):
+        """记录一次超时：按超时值计入延迟，并把该主机的超时下限翻倍"""
+        self.record(host, timeout)
+        with self._lock:
+            self._backoff[host] = min(self.max_timeout, max(self._backoff.get(host, 0.0), timeout * 2))
+
+    def record_account(self, key: str, elapsed: float):
+        """记录一个账号完整签到流程的耗时"""
+        self._update(self._account_cost, key, elapsed)
+
+    def timeout(self, host: str, default: float) -> float:
+        """
+        获取某主机的请求超时
+
+        按观测延迟自适应；样本不足时不低于默认值，发生过超时后不低于退避值；
+        结果不超过剩余预算。
+        """
+        latency = self._latency.get(host)
+        if latency is None:
+            value = default
+        else:
+            value = min(self.max_timeout, max(self.min_timeout, latency * self.factor))
+            if self._samples.get(host, 0) < self.min_samples:
+                value = max(value, default)
+        value = max(value, self._backoff.get(host, 0.0))
+        return max(0.1, min(value, self.remaining()))
+
+    def seed_account(self, key: str, estimate: float):
+        """设置单账号耗时的初始估计（来自历史或签到器默认值），本次运行有实测后以实测为准"""
+        with self._lock:
+            self._account_estimate[key] = estimate
+
+    def can_afford(self, key: str, default: Optional[float] = None) -> bool:
+        """
+        剩余预算是否足够完成一个账号的签到
+
+        优先使用本次实测耗时，其次初始估计，最后 default，缺省为 min_timeout。
+        """
+        estimate = self._account_cost.get(key, self._account_estimate.get(key, default))
+        if estimate is None:
+            estimate = self.min_timeout
+        return self.remaining() >= estimate
@@ -6,11 +6,19 @@
 import logging
 from typing import List, Dict, Any
 from collections import defaultdict
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue, Empty
 from base_checkin import BaseCheckin
+from budget import RunBudget
+from history import HistoryStore
+from probe import probe_host, format_probe
 from sspanel import SSPanelCheckin
 from glados import GLaDOSCheckin
 from clcn import CLCNCheckin
 from notify import send_notification
+from config import get_run_config
 
 # 配置日志
 logging.basicConfig(
@@ -19,6 +27,13 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 默认整次运行预算（秒）
+DEFAULT_DEADLINE = 900
+# 默认并发签到数
+DEFAULT_WORKERS = 4
+# 截止时间后等待进行中任务结束的宽限期（秒）
+DEFAULT_GRACE = 30
+
 
 def group_results_by_platform(results: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
     grouped = defaultdict(list)
@@ -32,7 +47,26 @@ class CheckinManager:
     
     def __init__(self):
         self.checkers: List[BaseCheckin] = []
+        config = get_run_config() or {}
+        self.workers = max(1, config.get('workers', DEFAULT_WORKERS))
+        self.grace = config.get('grace', DEFAULT_GRACE)
+        self.history = HistoryStore(config.get('history_path'))
+        self.preflight = config.get('preflight', True)
+        self.probes: Dict[str, Dict[str, Any]] = {}
+        self.budget = self._init_budget(config)
         self._init_checkers()
+        for checker in self.checkers:
+            checker.budget = self.budget
+    
+    def _init_budget(self, config: Dict[str, Any]) -> RunBudget:
+        """初始化运行预算"""
+        deadline = config.get('deadline', DEFAULT_DEADLINE)
+        logger.info(f"⏱️ 运行预算: {deadline} 秒")
+        return RunBudget(
+            total_seconds=deadline,
+            min_timeout=config.get('min_timeout', 3.0),
+            max_timeout=config.get('max_timeout', 60.0)
+        )
     
     def _init_checkers(self):
         """初始化签到器"""
@@ -60,39 +94,198 @@ class CheckinManager:
         except Exception as e:
             logger.warning(f"❌ 首都图书馆签到器初始化失败: {e}")
     
-    def run_all(self) -> List[Dict[str, Any]]:
-        """执行所有签到器"""
-        all_results = []
+    def _preflight(self):
+        """
+        并发探测所有站点，每个主机只探测一次
         
-        for checker in self.checkers:
-            try:
-                logger.info(f"🚀 开始执行 {checker.get_name()} 签到")
-                results = checker.checkin()
-                # 标记平台名
-                for r in results:
-                    r['platform'] = checker.get_name()
-                all_results.extend(results)
-                
-                # 统计当前签到器结果
-                success_count = sum(1 for r in results if r['success'])
-                total_count = len(results)
-                
-                if success_count == total_count:
-                    logger.info(f"🎉 {checker.get_name()} 完成: {success_count}/{total_count} 全部成功")
-                elif success_count > 0:
-                    logger.info(f"⚠️ {checker.get_name()} 完成: {success_count}/{total_count} 部分成功")
+        不可达主机上的账号直接标记，不再逐个走登录或浏览器流程。
+        """
+        urls = {checker.host: checker.url for checker in self.checkers if checker.host}
+        if not urls:
+            return
+        
+        logger.info(f"🩺 预检 {len(urls)} 个站点")
+        with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+            futures = {
+                host: executor.submit(probe_host, url, self.budget.timeout(host, 10))
+                for host, url in urls.items()
+            }
+            for host, future in futures.items():
+                probe = future.result()
+                self.probes[host] = probe
+                # 探测延迟只用于报告，不参与请求超时的自适应
+                if probe['ok']:
+                    logger.info(f"  {format_probe(probe)}")
                 else:
-                    logger.error(f"💥 {checker.get_name()} 完成: {success_count}/{total_count} 全部失败")
-                
+                    logger.error(f"  {format_probe(probe)}")
+    
+    def probe_report(self) -> List[str]:
+        """站点探测报告"""
+        return [format_probe(probe) for probe in self.probes.values()]
+    
+    def _plan_tasks(self) -> List[Dict[str, Any]]:
+        """
+        展开所有签到器的账号任务，并按历史耗时从长到短排序
+        
+        最慢的任务（如首都图书馆浏览器签到）最先开始，缩短并发运行的总时长。
+        """
+        tasks = []
+        for order, checker in enumerate(self.checkers):
+            try:
+                accounts = checker.get_accounts()
             except Exception as e:
                 logger.error(f"💥 {checker.get_name()} 执行异常: {e}")
-                all_results.append({
-                    'success': False,
-                    'account': checker.get_name(),
-                    'platform': checker.get_name(),
-                    'message': f'执行异常: {str(e)}'
-                })
+                tasks.append({'checker': checker, 'order': order, 'error': e})
+                continue
+            
+            probe = self.probes.get(checker.host)
+            if probe and not probe['ok']:
+                for account in accounts:
+                    tasks.append({'checker': checker, 'order': order, 'account': account, 'probe': probe})
+                continue
+            
+            observed = []
+            for account in accounts:
+                estimate = self.history.estimate(checker.get_name(), checker.host, account['name'])
+                if estimate is not None:
+                    observed.append(estimate)
+                else:
+                    estimate = checker.default_cost
+                tasks.append({'checker': checker, 'order': order, 'account': account, 'estimate': estimate})
+            
+            # 用历史耗时（没有历史时用签到器默认值）预热预算中的单账号耗时估计
+            self.budget.seed_account(checker.get_name(), max(observed) if observed else checker.default_cost)
+        
+        tasks.sort(key=lambda t: t.get('estimate', 0), reverse=True)
+        return tasks
+    
+    def _run_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """执行单个账号任务"""
+        checker = task['checker']
+        if 'error' in task:
+            return {
+                'success': False,
+                'account': checker.get_name(),
+                'message': f"执行异常: {str(task['error'])}"
+            }
+        
+        if 'probe' in task:
+            return {
+                'success': False,
+                'host_down': True,
+                'account': task['account']['name'],
+                'message': f"主机不可达: {task['probe'].get('error', '未知错误')}"
+            }
+        
+        try:
+            return checker.run_account(task['account'])
+        except Exception as e:
+            logger.error(f"💥 {checker.get_name()} 执行异常: {e}")
+            return {
+                'success': False,
+                'account': task['account']['name'],
+                'message': f'执行异常: {str(e)}'
+            }
+    
+    def _unfinished_result(self, task: Dict[str, Any], started: bool) -> Dict[str, Any]:
+        """截止时间（含宽限期）到达时仍未完成的任务结果"""
+        account = task.get('account') or {'name': task['checker'].get_name()}
+        if not started:
+            return task['checker'].skipped_result(account)
+        return {
+            'success': False,
+            'timed_out': True,
+            'account': account['name'],
+            'message': '超出运行预算，未完成'
+        }
+    
+    def _execute(self, tasks: List[Dict[str, Any]]):
+        """
+        用守护线程并发执行任务，结果写入 task['result']
+        
+        截止时间后不再启动新任务；进行中的任务的请求超时受预算限制，通常会在截止时间
+        附近结束，最多再等待 grace 秒。仍未结束的任务被放弃，守护线程不会阻止进程退出。
+        """
+        pending: Queue = Queue()
+        for task in tasks:
+            pending.put(task)
+        lock = threading.Lock()
+        closed = False
+        
+        def worker():
+            while not self.budget.expired():
+                try:
+                    task = pending.get_nowait()
+                except Empty:
+                    return
+                with lock:
+                    if closed:
+                        return
+                    task['started'] = True
+                result = self._run_task(task)
+                with lock:
+                    if not closed:
+                        task['result'] = result
+        
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        
+        remaining = self.budget.remaining()
+        end = None if remaining == float('inf') else time.monotonic() + remaining + self.grace
+        for thread in threads:
+            thread.join(None if end is None else max(0.0, end - time.monotonic()))
+        
+        with lock:
+            closed = True
+            for task in tasks:
+                if 'result' not in task:
+                    task['result'] = self._unfinished_result(task, task.get('started', False))
+    
+    def run_all(self) -> List[Dict[str, Any]]:
+        """预检站点后并发执行所有签到器，慢任务优先"""
+        if self.preflight:
+            self._preflight()
+        
+        tasks = self._plan_tasks()
+        logger.info(f"🚀 共 {len(tasks)} 个签到任务，并发数 {self.workers}")
+        self._execute(tasks)
+        
+        for task in tasks:
+            result = task['result']
+            result['platform'] = task['checker'].get_name()
+            if 'duration' in result:
+                self.history.record(
+                    result['platform'], task['checker'].host, result['account'],
+                    result['duration'], result['success']
+                )
+        
+        # 恢复配置顺序输出，并统计各签到器结果
+        all_results = []
+        for order, checker in enumerate(self.checkers):
+            results = [t['result'] for t in tasks if t['order'] == order]
+            all_results.extend(results)
+            
+            success_count = sum(1 for r in results if r['success'])
+            skipped_count = sum(1 for r in results if r.get('skipped'))
+            host_down_count = sum(1 for r in results if r.get('host_down'))
+            timed_out_count = sum(1 for r in results if r.get('timed_out'))
+            total_count = len(results)
+            
+            if host_down_count:
+                logger.error(f"🔌 {checker.get_name()} 主机不可达，{host_down_count} 个账号未执行")
+            if skipped_count:
+                logger.warning(f"⏭️ {checker.get_name()} 因预算不足跳过 {skipped_count} 个账号")
+            if timed_out_count:
+                logger.error(f"⌛ {checker.get_name()} 超出截止时间未完成 {timed_out_count} 个账号")
+            if success_count == total_count:
+                logger.info(f"🎉 {checker.get_name()} 完成: {success_count}/{total_count} 全部成功")
+            elif success_count > 0:
+                logger.info(f"⚠️ {checker.get_name()} 完成: {success_count}/{total_count} 部分成功")
+            else:
+                logger.error(f"💥 {checker.get_name()} 完成: {success_count}/{total_count} 全部失败")
         
+        self.history.save()
         return all_results
     
     def run_specific(self, checker_name: str) -> List[Dict[str, Any]]:
@@ -130,6 +323,7 @@ def main():
     
     # 等级总结
     logger.info("-" * 50)
+    logger.info(f"⏱️ 总耗时: {manager.budget.elapsed():.1f} 秒")
     if success_count == total_count:
         logger.info(f"🎉 签到完成: {success_count}/{total_count} 全部成功")
     elif success_count > 0:
@@ -137,6 +331,20 @@ def main():
     else:
         logger.error(f"💥 签到完成: {success_count}/{total_count} 全部失败")
     
+    # 站点探测结果
+    probes = manager.probe_report()
+    if probes:
+        logger.info("🩺 站点探测:")
+        for line in probes:
+            logger.info(f"  {line}")
+    
+    # 站点延迟趋势
+    trends = manager.history.trend_report()
+    if trends:
+        logger.info("📈 延迟趋势:")
+        for line in trends:
+            logger.info(f"  {line}")
+    
     # 分平台输出详细结果
     logger.info("📊 详细结果:")
     grouped = group_results_by_platform(results)
@@ -145,13 +353,19 @@ def main():
         for i, result in enumerate(items, 1):
             if result['success']:
                 logger.info(f"    {i}. ✅ 账号: {result['account']} | {result['message']}")
+            elif result.get('skipped'):
+                logger.warning(f"    {i}. ⏭️ 账号: {result['account']} | {result['message']}")
+            elif result.get('host_down'):
+                logger.error(f"    {i}. 🔌 账号: {result['account']} | {result['message']}")
+            elif result.get('timed_out'):
+                logger.error(f"    {i}. ⌛ 账号: {result['account']} | {result['message']}")
             else:
                 logger.error(f"    {i}. ❌ 账号: {result['account']} | {result['message']}")
     
     # 发送通知
     logger.info("-" * 50)
     logger.info("📱 开始发送通知")
-    send_notification(results)
+    send_notification(results, {'🩺 站点探测': probes, '📈 延迟趋势': trends})
     logger.info("✅ 通知发送完成")
     logger.info("=" * 50)
 
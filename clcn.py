@@ -15,9 +15,10 @@ logger = logging.getLogger(__name__)
 class CLCNCheckin(BaseCheckin):
     """CLCN 签到器"""
     
+    # 浏览器 + 验证码流程，明显慢于接口签到
+    default_cost = 60.0
+    
     def __init__(self):
-        super().__init__("CLCN")
-        
         # 获取配置
         config = get_clcn_config()
         if not config:
@@ -28,38 +29,52 @@ class CLCNCheckin(BaseCheckin):
         
         if not self.url or not self.accounts:
             raise ValueError("CLCN 配置不完整")
+        
+        super().__init__("CLCN", self.url)
     
-    def checkin(self) -> List[Dict[str, Any]]:
-        """执行签到"""
-        results = []
+    def get_accounts(self) -> List[Dict[str, Any]]:
+        """获取账号列表"""
+        return [dict(account, name=account.get('reader_card') or 'unknown') for account in self.accounts]
+    
+    def checkin_account(self, account: Dict[str, Any]) -> Dict[str, Any]:
+        """单个账号签到"""
+        reader_card = account.get('reader_card', '')
+        password = account.get('password', '')
+        
+        if not reader_card or not password:
+            return {
+                'success': False,
+                'account': account['name'],
+                'message': '配置不完整'
+            }
         
-        for account in self.accounts:
-            reader_card = account.get('reader_card', '')
-            password = account.get('password', '')
-            
-            if not reader_card or not password:
-                results.append({
-                    'success': False,
-                    'account': reader_card or 'unknown',
-                    'message': '配置不完整'
-                })
-                continue
-            
-            try:
-                success, message = self._sign_account(reader_card, password)
-                results.append({
-                    'success': success,
-                    'account': reader_card,
-                    'message': message
-                })
-            except Exception as e:
-                results.append({
-                    'success': False,
-                    'account': reader_card,
-                    'message': f'异常: {str(e)}'
-                })
+        try:
+            success, message = self._sign_account(reader_card, password)
+            return {
+                'success': success,
+                'account': reader_card,
+                'message': message
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'account': reader_card,
+                'message': f'异常: {str(e)}'
+            }
+
+    def _refresh_timeout(self, page):
+        """
+        按剩余运行预算重新设置页面超时，预算耗尽时中止签到
         
-        return results
+        浏览器各步骤耗时差异大，不按单次页面加载自适应，只用预算作为 60 秒超时的上限。
+        """
+        if self.budget.expired():
+            raise TimeoutError("运行预算已耗尽")
+        page.set_default_timeout(min(60, self.budget.remaining()) * 1000)
+
+    def _wait(self, page, milliseconds: int):
+        """固定等待，不超过剩余运行预算"""
+        page.wait_for_timeout(min(milliseconds, self.budget.remaining() * 1000))
 
     def _sign_account(self, reader_card: str, password: str, max_retries: int = 3) -> tuple[bool, str]:
         """单个账户签到"""
@@ -70,17 +85,19 @@ class CLCNCheckin(BaseCheckin):
                 # 启动浏览器
                 browser = playwright.chromium.launch(headless=True)
                 page = browser.new_page()
-                page.set_default_timeout(60000)  # 全局超时 60 秒
 
                 # 先访问首页
+                self._refresh_timeout(page)
                 logger.info(f"访问首页: {self.url}")
                 page.goto(self.url)
 
                 # 等待页面加载完成
+                self._refresh_timeout(page)
                 page.wait_for_load_state("networkidle")
 
                 # 点击用户登录链接
                 logger.info("点击用户登录链接")
+                self._refresh_timeout(page)
                 login_link = page.query_selector("li.clcn-user-login a")
                 if login_link:
                     login_link.click()
@@ -93,6 +110,7 @@ class CLCNCheckin(BaseCheckin):
 
                 # 填写读者卡号
                 logger.info(f"填写读者卡号: {reader_card}")
+                self._refresh_timeout(page)
                 page.fill("#loginform-username", reader_card)
 
                 # 填写密码
@@ -102,6 +120,7 @@ class CLCNCheckin(BaseCheckin):
                 # 尝试登录，最多重试 max_retries 次
                 for attempt in range(max_retries):
                     logger.info(f"尝试第 {attempt + 1} 次登录")
+                    self._refresh_timeout(page)
 
                     # 处理验证码
                     captcha_text = ""
@@ -141,10 +160,11 @@ class CLCNCheckin(BaseCheckin):
 
                     # 点击登录按钮
                     logger.info("点击登录按钮")
+                    self._refresh_timeout(page)
                     page.click("button[name='login-button']")
 
                     # 等待页面加载
-                    page.wait_for_timeout(5000)
+                    self._wait(page, 5000)
 
                     # 检查是否登录成功
                     if "登录失败" in page.content():
@@ -164,13 +184,14 @@ class CLCNCheckin(BaseCheckin):
                     break  # 登录成功，跳出重试循环
 
                 # 点击签到按钮
+                self._refresh_timeout(page)
                 try:
                     logger.info("尝试点击签到按钮")
                     page.click("button.btn.btn-primary.btn-sign")
                     logger.info("签到按钮点击成功")
 
                     # 等待签到结果
-                    page.wait_for_timeout(3000)
+                    self._wait(page, 3000)
 
                     # 检查签到结果
                     if "签到成功" in page.content():
@@ -182,8 +203,11 @@ class CLCNCheckin(BaseCheckin):
                     return True, message
 
                 except Exception as e:
-                    logger.warning(f"签到按钮未找到或已签到: {e}")
                     browser.close()
+                    if self.budget.expired():
+                        logger.error(f"签到按钮点击时运行预算耗尽: {e}")
+                        return False, "运行预算已耗尽，签到未完成"
+                    logger.warning(f"签到按钮未找到或已签到: {e}")
                     return True, "可能已经签到过了或找不到签到按钮"
 
         except Exception as e:
@@ -50,4 +50,8 @@ def get_notify_config():
 
 def get_clcn_config():
     """获取首都图书馆配置"""
-    return get_config('clcn')
\ No newline at end of file
+    return get_config('clcn')
+
+def get_run_config():
+    """获取运行配置（可选）"""
+    return get_config('run')
@@ -12,8 +12,10 @@ import json
 class GLaDOSCheckin(BaseCheckin):
     """GLaDOS签到器"""
     
+    default_cost = 3.0
+    
     def __init__(self):
-        super().__init__("GLaDOS")
+        super().__init__("GLaDOS", "https://glados.rocks")
         
         # 获取配置
         config = get_glados_config()
@@ -25,34 +27,32 @@ class GLaDOSCheckin(BaseCheckin):
         if not self.cookies:
             raise ValueError("GLaDOS配置不完整")
     
-    def checkin(self) -> List[Dict[str, Any]]:
-        """执行签到"""
-        results = []
-        
-        for i, cookie in enumerate(self.cookies):
-            if not cookie:
-                results.append({
-                    'success': False,
-                    'account': f'account_{i+1}',
-                    'message': 'cookie 为空'
-                })
-                continue
-            
-            try:
-                success, message = self._sign_account(cookie)
-                results.append({
-                    'success': success,
-                    'account': f'account_{i+1}',
-                    'message': message
-                })
-            except Exception as e:
-                results.append({
-                    'success': False,
-                    'account': f'account_{i+1}',
-                    'message': f'异常: {str(e)}'
-                })
+    def get_accounts(self) -> List[Dict[str, Any]]:
+        """获取账号列表"""
+        return [{'name': f'account_{i+1}', 'cookie': cookie} for i, cookie in enumerate(self.cookies)]
+    
+    def checkin_account(self, account: Dict[str, Any]) -> Dict[str, Any]:
+        """单个账号签到"""
+        if not account['cookie']:
+            return {
+                'success': False,
+                'account': account['name'],
+                'message': 'cookie 为空'
+            }
         
-        return results
+        try:
+            success, message = self._sign_account(account['cookie'])
+            return {
+                'success': success,
+                'account': account['name'],
+                'message': message
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'account': account['name'],
+                'message': f'异常: {str(e)}'
+            }
     
     def _sign_account(self, cookie: str) -> tuple[bool, str]:
         """单个账户签到"""
@@ -68,7 +68,10 @@ class GLaDOSCheckin(BaseCheckin):
         payload = {'token': 'glados.one'}
 
         # 签到
-        checkin_resp = session.post(checkin_url, headers=headers, data=json.dumps(payload), timeout=20)
+        checkin_resp = self.timed_call(
+            lambda timeout: session.post(checkin_url, headers=headers, data=json.dumps(payload), timeout=timeout),
+            20, (requests.Timeout,)
+        )
         checkin_resp.raise_for_status()
         checkin_json = checkin_resp.json()
 
@@ -0,0 +1,128 @@
+"""
+延迟历史模块
+持久化保存每次运行中各账号、各站点的耗时与结果
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 默认状态目录，GitHub Actions 中通过缓存在运行之间保留
+DEFAULT_STATE_DIR = '.state'
+
+
+class HistoryStore:
+    """耗时历史存储"""
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 30):
+        """
+        Args:
+            path: 历史文件路径
+            max_entries: 每个账号/站点保留的最近记录数
+        """
+        self.path = path or os.path.join(DEFAULT_STATE_DIR, 'history.json')
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}
+        self.data = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        """读取历史文件，不存在或损坏时返回空历史"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            logger.info(f"历史记录加载成功: {self.path}")
+        except FileNotFoundError:
+            data = {}
+        except Exception as e:
+            logger.warning(f"历史记录加载失败，将重新记录: {e}")
+            data = {}
+        data.setdefault('accounts', {})
+        data.setdefault('sites', {})
+        return data
+
+    def save(self):
+        """汇总本次运行的站点数据并写回历史文件"""
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self._lock:
+            for site, entries in self._pending.items():
+                durations = [e['duration'] for e in entries]
+                self._append(self.data['sites'], site, {
+                    'time': now,
+                    'mean': sum(durations) / len(durations),
+                    'count': len(entries),
+                    'success': sum(1 for e in entries if e['success'])
+                })
+            self._pending = {}
+            self.data['last_run'] = now
+
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                with open(self.path, 'w', encoding='utf-8') as f:
+                    json.dump(self.data, f, ensure_ascii=False, indent=2)
+                logger.info(f"历史记录保存成功: {self.path}")
+            except Exception as e:
+                logger.error(f"历史记录保存失败: {e}")
+
+    def _append(self, table: Dict[str, List[Dict[str, Any]]], key: str, entry: Dict[str, Any]):
+        entries = table.setdefault(key, [])
+        entries.append(entry)
+        del entries[:-self.max_entries]
+
+    @staticmethod
+    def account_key(platform: str, account: str) -> str:
+        """账号在历史中的键"""
+        return f"{platform}/{account}"
+
+    def record(self, platform: str, site: str, account: str, duration: float, success: bool):
+        """记录一个账号本次的耗时与结果"""
+        entry = {
+            'time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'duration': round(duration, 3),
+            'success': success
+        }
+        with self._lock:
+            self._append(self.data['accounts'], self.account_key(platform, account), entry)
+            self._pending.setdefault(site, []).append(entry)
+
+    def estimate(self, platform: str, site: str, account: str, default: Optional[float] = None,
+                 window: int = 5) -> Optional[float]:
+        """
+        估计账号签到耗时
+
+        优先使用该账号最近的耗时，其次使用站点平均耗时，都没有时返回默认值。
+        """
+        entries = self.data['accounts'].get(self.account_key(platform, account), [])[-window:]
+        if entries:
+            return sum(e['duration'] for e in entries) / len(entries)
+        runs = self.data['sites'].get(site, [])[-window:]
+        if runs:
+            return sum(r['mean'] for r in runs) / len(runs)
+        return default
+
+    def trend_report(self, window: int = 7, threshold: float = 1.5) -> List[str]:
+        """
+        生成本次运行各站点的延迟趋势报告，需在 save() 之后调用
+
+        Args:
+            window: 基线取最近多少次运行（不含本次）
+            threshold: 本次平均耗时超过基线多少倍视为退化
+        """
+        lines = []
+        last_run = self.data.get('last_run')
+        for site, runs in self.data['sites'].items():
+            # 本次运行没有实测耗时的站点（全部跳过或不可达）不参与报告
+            if len(runs) < 2 or runs[-1]['time'] != last_run:
+                continue
+            latest = runs[-1]['mean']
+            baseline_runs = runs[-window - 1:-1]
+            baseline = sum(r['mean'] for r in baseline_runs) / len(baseline_runs)
+            ratio = latest / baseline if baseline > 0 else 1.0
+            icon = "⚠️" if ratio >= threshold else "✅"
+            lines.append(f"{icon} {site}: 本次 {latest:.1f}s / 基线 {baseline:.1f}s ({ratio:.2f}x)")
+        return lines
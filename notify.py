@@ -4,20 +4,49 @@
 """
 
 import requests
+import json
 import logging
-from typing import List, Dict, Any
+import os
+from typing import List, Dict, Any, Optional
 from collections import defaultdict
 from config import get_notify_config
+from history import DEFAULT_STATE_DIR
 
 logger = logging.getLogger(__name__)
 
+# 各状态的图标与文字
+STATUS_DISPLAY = {
+    'success': ("✅", "成功"),
+    'failure': ("❌", "失败"),
+    'skipped': ("⏭️", "跳过"),
+    'host_down': ("🔌", "主机不可达"),
+    'timed_out': ("⌛", "超时未完成"),
+}
 
-def send_notification(results: List[Dict[str, Any]]):
+# 变化通知模式下默认每隔多少次运行发送一次完整报告
+DEFAULT_DIGEST_EVERY = 7
+
+
+def get_status(result: Dict[str, Any]) -> str:
+    """获取签到结果的状态"""
+    if result['success']:
+        return 'success'
+    if result.get('skipped'):
+        return 'skipped'
+    if result.get('host_down'):
+        return 'host_down'
+    if result.get('timed_out'):
+        return 'timed_out'
+    return 'failure'
+
+
+def send_notification(results: List[Dict[str, Any]], sections: Optional[Dict[str, List[str]]] = None):
     """
     发送签到结果通知
     
     Args:
         results: 签到结果列表
+        sections: 附加报告段落，标题 -> 行列表
     """
     if not results:
         logger.info("没有签到结果，跳过通知")
@@ -33,15 +62,79 @@ def send_notification(results: List[Dict[str, Any]]):
     success_count = sum(1 for r in results if r['success'])
     total_count = len(results)
     
-    # 构建通知内容
-    title = f"🎯 自动签到报告 ({success_count}/{total_count})"
-    content = build_notification_content(results)
+    if notify_config.get('mode') != 'changes':
+        title = f"🎯 自动签到报告 ({success_count}/{total_count})"
+        content = build_notification_content(results, sections)
+        send_server_chan(title, content, notify_config)
+        return
+    
+    # 变化通知模式：只推送与上次运行相比的状态变化
+    state_path = notify_config.get('state_path') or os.path.join(DEFAULT_STATE_DIR, 'notify.json')
+    state = load_notify_state(state_path)
+    state['runs'] = state.get('runs', 0) + 1
+    digest_every = notify_config.get('digest_every', DEFAULT_DIGEST_EVERY)
+    
+    previous = state.get('accounts', {})
+    state['accounts'] = {
+        f"{r.get('platform', '未知平台')}/{r['account']}": get_status(r) for r in results
+    }
+    
+    if not previous or (digest_every and state['runs'] % digest_every == 0):
+        title = f"🎯 自动签到报告 ({success_count}/{total_count})"
+        content = build_notification_content(results, sections)
+    else:
+        changes = diff_results(previous, results)
+        if not changes:
+            logger.info("签到状态与上次相同，跳过通知")
+            save_notify_state(state_path, state)
+            return
+        title = f"🎯 自动签到变化 ({success_count}/{total_count}, {len(changes)} 项变化)"
+        content = build_change_content(results, changes, sections)
+    
+    # 发送成功后才更新状态，避免变化丢失
+    if send_server_chan(title, content, notify_config):
+        save_notify_state(state_path, state)
+
+
+def load_notify_state(path: str) -> Dict[str, Any]:
+    """读取上次通知的状态"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"通知状态加载失败，将发送完整报告: {e}")
+        return {}
+
+
+def save_notify_state(path: str, state: Dict[str, Any]):
+    """保存本次通知的状态"""
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+    except Exception as e:
+        logger.error(f"通知状态保存失败: {e}")
+
+
+def diff_results(previous: Dict[str, str], results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    对比上次状态，返回发生变化的结果
     
-    # 发送通知
-    send_server_chan(title, content, notify_config)
+    Returns:
+        List[Dict[str, Any]]: 变化列表，每项包含 result 和 previous（上次状态，新账号为 None）
+    """
+    changes = []
+    for r in results:
+        key = f"{r.get('platform', '未知平台')}/{r['account']}"
+        before = previous.get(key)
+        if before != get_status(r):
+            changes.append({'result': r, 'previous': before})
+    return changes
 
 
-def build_notification_content(results: List[Dict[str, Any]]) -> str:
+def build_notification_content(results: List[Dict[str, Any]], sections: Optional[Dict[str, List[str]]] = None) -> str:
     """构建分等级、分平台、分账号的通知内容"""
     if not results:
         return "❌ 没有签到结果"
@@ -76,16 +169,20 @@ def build_notification_content(results: List[Dict[str, Any]]) -> str:
     for platform, items in grouped.items():
         content_lines.append(f"### 🏷️ 平台：{platform}")
         for i, result in enumerate(items, 1):
-            if result['success']:
-                status_icon = "✅"
-                status_text = "成功"
-            else:
-                status_icon = "❌"
-                status_text = "失败"
+            status_icon, status_text = STATUS_DISPLAY[get_status(result)]
             content_lines.append(f"- **账号 {i}：{result['account']}**  {status_icon} {status_text}")
             content_lines.append(f"    - 💬 {result['message']}")
         content_lines.append("")
     
+    # 附加报告段落
+    for section_title, lines in (sections or {}).items():
+        if not lines:
+            continue
+        content_lines.append(f"### {section_title}")
+        for line in lines:
+            content_lines.append(f"- {line}")
+        content_lines.append("")
+    
     # 添加底部信息
     content_lines.append("---")
     content_lines.append("")
@@ -95,17 +192,70 @@ def build_notification_content(results: List[Dict[str, Any]]) -> str:
     return "\n".join(content_lines)
 
 
+def build_change_content(results: List[Dict[str, Any]], changes: List[Dict[str, Any]],
+                         sections: Optional[Dict[str, List[str]]] = None) -> str:
+    """构建只包含状态变化和汇总统计的通知内容"""
+    content_lines = []
+    content_lines.append("🔔 **签到状态变化**")
+    content_lines.append("")
+    
+    # 汇总统计
+    counts = defaultdict(int)
+    for r in results:
+        counts[get_status(r)] += 1
+    summary = " | ".join(
+        f"{icon} {text} {counts[status]}" for status, (icon, text) in STATUS_DISPLAY.items() if counts[status]
+    )
+    content_lines.append(f"📊 共 {len(results)} 个账号：{summary}")
+    content_lines.append("")
+    content_lines.append("---")
+    content_lines.append("")
+    
+    # 新失败在前，恢复在后
+    changes = sorted(changes, key=lambda c: c['result']['success'])
+    for change in changes:
+        result = change['result']
+        icon, text = STATUS_DISPLAY[get_status(result)]
+        if change['previous'] is None:
+            before = "新账号"
+        else:
+            # 状态文件可能来自旧版本或被手动修改
+            before = STATUS_DISPLAY.get(change['previous'], ("", f"未知状态({change['previous']})"))[1]
+        content_lines.append(
+            f"- **{result.get('platform', '未知平台')} / {result['account']}**  {before} → {icon} {text}"
+        )
+        content_lines.append(f"    - 💬 {result['message']}")
+    content_lines.append("")
+    
+    # 附加报告段落只保留异常行
+    for section_title, lines in (sections or {}).items():
+        lines = [line for line in lines if not line.startswith("✅")]
+        if not lines:
+            continue
+        content_lines.append(f"### {section_title}")
+        for line in lines:
+            content_lines.append(f"- {line}")
+        content_lines.append("")
+    
+    content_lines.append("---")
+    content_lines.append("")
+    content_lines.append("⏰ 签到时间: " + get_current_time())
+    content_lines.append("🤖 由自动签到机器人发送")
+    
+    return "\n".join(content_lines)
+
+
 def get_current_time() -> str:
     """获取当前时间"""
     from datetime import datetime
     return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
 
-def send_server_chan(title: str, content: str, config: Dict[str, Any]):
-    """发送Server酱通知"""
+def send_server_chan(title: str, content: str, config: Dict[str, Any]) -> bool:
+    """发送Server酱通知，返回是否发送成功"""
     sckey = config.get('key')
     if not sckey:
-        return
+        return False
     
     try:
         url = f"https://sctapi.ftqq.com/{sckey}.send"
@@ -120,8 +270,11 @@ def send_server_chan(title: str, content: str, config: Dict[str, Any]):
         result = response.json()
         if result.get('code') == 0:
             logger.info("Server酱通知发送成功")
+            return True
         else:
             logger.warning(f"Server酱通知发送失败: {result.get('message', '未知错误')}")
             
     except Exception as e:
         logger.error(f"Server酱通知发送异常: {e}")
+    
+    return False
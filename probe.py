@@ -0,0 +1,109 @@
+"""
+主机探测模块
+签到前对每个站点做一次 DNS、TCP/TLS 和轻量 HTTP 探测
+"""
+
+import socket
+import ssl
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Any
+from urllib.parse import urlparse
+
+# 与签到器一致的浏览器 UA，避免被 CDN 按默认 UA 拦截
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/102.0.0.0 Safari/537.36'
+
+# 视为站点不可用的网关错误状态码（含 Cloudflare 的 52x）
+GATEWAY_ERRORS = {502, 503, 504} | set(range(520, 528))
+
+
+def _resolve(hostname: str, port: int, timeout: float) -> list:
+    """带超时的 DNS 解析"""
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        future = executor.submit(socket.getaddrinfo, hostname, port, type=socket.SOCK_STREAM)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            raise TimeoutError("DNS 解析超时")
+    finally:
+        executor.shutdown(wait=False)
+
+
+def _connect(addrinfo: list, timeout: float) -> socket.socket:
+    """依次尝试解析出的地址，返回第一个连接成功的套接字"""
+    error: Exception = OSError("没有可用地址")
+    for family, socktype, proto, _, address in addrinfo:
+        sock = socket.socket(family, socktype, proto)
+        try:
+            sock.settimeout(timeout)
+            sock.connect(address)
+            return sock
+        except OSError as e:
+            sock.close()
+            error = e
+    raise error
+
+
+def probe_host(url: str, timeout: float = 10) -> Dict[str, Any]:
+    """
+    探测站点是否可达
+
+    Args:
+        url: 站点地址
+        timeout: 每个阶段的超时（秒）
+
+    Returns:
+        Dict[str, Any]: 探测结果，包含：
+            - ok: bool - 是否可达
+            - host: str - 主机名
+            - dns / connect / tls / http: float - 各阶段耗时（秒），未执行的阶段不存在
+            - status: int - HTTP 状态码
+            - error: str - 失败原因
+    """
+    parsed = urlparse(url)
+    hostname = parsed.hostname or ''
+    https = parsed.scheme == 'https'
+    port = parsed.port or (443 if https else 80)
+    result: Dict[str, Any] = {'ok': False, 'host': parsed.netloc}
+
+    try:
+        # DNS
+        start = time.monotonic()
+        addrinfo = _resolve(hostname, port, timeout)
+        result['dns'] = time.monotonic() - start
+
+        # TCP / TLS
+        start = time.monotonic()
+        with _connect(addrinfo, timeout) as sock:
+            result['connect'] = time.monotonic() - start
+            if https:
+                start = time.monotonic()
+                context = ssl.create_default_context()
+                with context.wrap_socket(sock, server_hostname=hostname):
+                    result['tls'] = time.monotonic() - start
+
+        # HTTP
+        response = requests.head(url, headers={'user-agent': USER_AGENT}, timeout=timeout, allow_redirects=False)
+        result['http'] = response.elapsed.total_seconds()
+        result['status'] = response.status_code
+        # 其他状态码（包括挑战页、HEAD 不支持等）说明主机在线，交给签到流程判断
+        if response.status_code in GATEWAY_ERRORS:
+            result['error'] = f"HTTP {response.status_code}"
+            return result
+    except Exception as e:
+        result['error'] = str(e) or type(e).__name__
+        return result
+
+    result['ok'] = True
+    return result
+
+
+def format_probe(result: Dict[str, Any]) -> str:
+    """格式化探测结果为单行文本"""
+    phases = [f"{name} {result[name] * 1000:.0f}ms" for name in ('dns', 'connect', 'tls', 'http') if name in result]
+    detail = " / ".join(phases)
+    if result['ok']:
+        return f"✅ {result['host']}: {detail}"
+    return f"🔌 {result['host']}: {result.get('error', '未知错误')}" + (f" ({detail})" if detail else "")
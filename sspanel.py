@@ -11,9 +11,9 @@ from config import get_sspanel_config
 class SSPanelCheckin(BaseCheckin):
     """SSPanel签到器"""
     
+    default_cost = 5.0
+    
     def __init__(self):
-        super().__init__("SSPanel")
-        
         # 获取配置
         config = get_sspanel_config()
         if not config:
@@ -24,38 +24,38 @@ class SSPanelCheckin(BaseCheckin):
         
         if not self.url or not self.accounts:
             raise ValueError("SSPanel配置不完整")
+        
+        super().__init__("SSPanel", self.url)
+    
+    def get_accounts(self) -> List[Dict[str, Any]]:
+        """获取账号列表"""
+        return [dict(account, name=account.get('email') or 'unknown') for account in self.accounts]
     
-    def checkin(self) -> List[Dict[str, Any]]:
-        """执行签到"""
-        results = []
+    def checkin_account(self, account: Dict[str, Any]) -> Dict[str, Any]:
+        """单个账号签到"""
+        email = account.get('email', '')
+        password = account.get('password', '')
         
-        for account in self.accounts:
-            email = account.get('email', '')
-            password = account.get('password', '')
-            
-            if not email or not password:
-                results.append({
-                    'success': False,
-                    'account': email or 'unknown',
-                    'message': '配置不完整'
-                })
-                continue
-            
-            try:
-                success, message = self._sign_account(email, password)
-                results.append({
-                    'success': success,
-                    'account': email,
-                    'message': message
-                })
-            except Exception as e:
-                results.append({
-                    'success': False,
-                    'account': email,
-                    'message': f'异常: {str(e)}'
-                })
+        if not email or not password:
+            return {
+                'success': False,
+                'account': account['name'],
+                'message': '配置不完整'
+            }
         
-        return results
+        try:
+            success, message = self._sign_account(email, password)
+            return {
+                'success': success,
+                'account': email,
+                'message': message
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'account': email,
+                'message': f'异常: {str(e)}'
+            }
     
     def _sign_account(self, email: str, password: str) -> tuple[bool, str]:
         """单个账户签到"""
@@ -74,7 +74,10 @@ class SSPanelCheckin(BaseCheckin):
         }
         
         # 登录
-        login_response = session.post(url=login_url, headers=headers, data=data, timeout=10)
+        login_response = self.timed_call(
+            lambda timeout: session.post(url=login_url, headers=headers, data=data, timeout=timeout),
+            10, (requests.Timeout,)
+        )
         login_response.raise_for_status()
         login_result = login_response.json()
         
@@ -82,7 +85,10 @@ class SSPanelCheckin(BaseCheckin):
             return False, f"登录失败: {login_result.get('msg', '未知错误')}"
         
         # 签到
-        checkin_response = session.post(url=check_url, headers=headers, timeout=10)
+        checkin_response = self.timed_call(
+            lambda timeout: session.post(url=check_url, headers=headers, timeout=timeout),
+            10, (requests.Timeout,)
+        )
         checkin_response.raise_for_status()
         checkin_result = checkin_response.json()
         
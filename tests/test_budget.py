@@ -0,0 +1,99 @@
+import pytest
+
+from base_checkin import BaseCheckin
+from budget import RunBudget
+
+
+class DummyCheckin(BaseCheckin):
+    default_cost = 60.0
+
+    def __init__(self):
+        super().__init__("Dummy", "https://example.com")
+        self.calls = 0
+
+    def get_accounts(self):
+        return [{'name': 'a'}, {'name': 'b'}]
+
+    def checkin_account(self, account):
+        self.calls += 1
+        return {'success': True, 'account': account['name'], 'message': 'ok'}
+
+
+def test_unlimited_budget_uses_default_timeout():
+    budget = RunBudget()
+    assert budget.remaining() == float('inf')
+    assert not budget.expired()
+    assert budget.timeout('example.com', 10) == 10
+
+
+def test_timeout_adapts_to_latency_within_bounds():
+    budget = RunBudget(min_timeout=3.0, max_timeout=60.0, factor=3.0, min_samples=1)
+    budget.record('fast', 0.1)
+    budget.record('slow', 100)
+    assert budget.timeout('fast', 10) == 3.0
+    assert budget.timeout('slow', 10) == 60.0
+
+
+def test_timeout_capped_by_remaining_budget():
+    budget = RunBudget(5)
+    assert budget.timeout('example.com', 60) <= 5
+
+
+def test_can_afford_falls_back_to_default_cost():
+    budget = RunBudget(4)
+    assert not budget.can_afford('CLCN', 60)
+    assert budget.can_afford('GLaDOS', 3)
+
+
+def test_can_afford_prefers_observed_cost():
+    budget = RunBudget(4)
+    budget.record_account('CLCN', 1)
+    assert budget.can_afford('CLCN', 60)
+
+
+def test_run_account_skips_when_budget_insufficient():
+    checker = DummyCheckin()
+    checker.budget = RunBudget(10)
+    results = checker.checkin()
+    assert checker.calls == 0
+    assert all(r['skipped'] and not r['success'] for r in results)
+
+
+def test_run_account_records_duration():
+    checker = DummyCheckin()
+    results = checker.checkin()
+    assert checker.calls == 2
+    assert all('duration' in r for r in results)
+
+
+def test_seeded_estimate_used_until_observed():
+    budget = RunBudget(10)
+    budget.seed_account('CLCN', 60)
+    assert not budget.can_afford('CLCN', 1)
+    budget.record_account('CLCN', 2)
+    assert budget.can_afford('CLCN', 1)
+
+
+def test_default_is_floor_until_enough_samples():
+    budget = RunBudget(min_samples=3)
+    budget.record('example.com', 0.2)
+    assert budget.timeout('example.com', 10) == 10
+    budget.record('example.com', 0.2)
+    budget.record('example.com', 0.2)
+    assert budget.timeout('example.com', 10) == 3.0
+
+
+def test_timeout_backs_off_after_fast_sample_then_slow_response():
+    checker = DummyCheckin()
+    checker.budget = RunBudget(min_samples=1)
+    checker.timed_call(lambda timeout: None, 10)
+    assert checker.budget.timeout(checker.host, 10) == 3.0
+
+    def slow(timeout):
+        assert timeout == 3.0
+        raise TimeoutError()
+
+    with pytest.raises(TimeoutError):
+        checker.timed_call(slow, 10)
+    assert checker.budget.timeout(checker.host, 10) >= 6.0
+    assert checker.timed_call(lambda timeout: timeout, 10) >= 6.0
@@ -0,0 +1,52 @@
+from history import HistoryStore
+
+
+def make_store(tmp_path):
+    return HistoryStore(str(tmp_path / 'history.json'))
+
+
+def test_estimate_prefers_account_then_site_then_default(tmp_path):
+    store = make_store(tmp_path)
+    assert store.estimate('SSPanel', 'a.com', 'x') is None
+    assert store.estimate('SSPanel', 'a.com', 'x', 5.0) == 5.0
+
+    store.record('SSPanel', 'a.com', 'x', 2.0, True)
+    store.record('SSPanel', 'a.com', 'x', 4.0, True)
+    store.save()
+    assert store.estimate('SSPanel', 'a.com', 'x', 5.0) == 3.0
+    assert store.estimate('SSPanel', 'a.com', 'y', 5.0) == 3.0
+
+
+def test_history_persists_between_runs(tmp_path):
+    store = make_store(tmp_path)
+    store.record('GLaDOS', 'glados.rocks', 'account_1', 1.0, True)
+    store.save()
+    assert make_store(tmp_path).estimate('GLaDOS', 'glados.rocks', 'account_1') == 1.0
+
+
+def test_trend_report_flags_regression(tmp_path):
+    store = make_store(tmp_path)
+    for duration in (1.0, 1.0, 5.0):
+        store = make_store(tmp_path)
+        store.record('CLCN', 'clcn.net.cn', '1', duration, True)
+        store.save()
+    lines = store.trend_report()
+    assert len(lines) == 1
+    assert lines[0].startswith("⚠️ clcn.net.cn")
+
+
+def test_trend_report_skips_sites_not_run_this_time(tmp_path):
+    store = make_store(tmp_path)
+    store.data['sites']['a.com'] = [
+        {'time': '2026-01-01 00:00:00', 'mean': 1.0, 'count': 1, 'success': 1},
+        {'time': '2026-01-02 00:00:00', 'mean': 5.0, 'count': 1, 'success': 1},
+    ]
+    store.save()
+    assert store.trend_report() == []
+
+
+def test_entries_are_bounded(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.json'), max_entries=3)
+    for i in range(5):
+        store.record('GLaDOS', 'glados.rocks', 'account_1', float(i), True)
+    assert [e['duration'] for e in store.data['accounts']['GLaDOS/account_1']] == [2.0, 3.0, 4.0]
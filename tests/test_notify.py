@@ -0,0 +1,65 @@
+import pytest
+
+import notify
+from notify import diff_results, get_status
+
+
+def result(account, success=True, **extra):
+    return dict(success=success, platform='GLaDOS', account=account, message='msg', **extra)
+
+
+def test_get_status():
+    assert get_status(result('a')) == 'success'
+    assert get_status(result('a', False)) == 'failure'
+    assert get_status(result('a', False, skipped=True)) == 'skipped'
+    assert get_status(result('a', False, host_down=True)) == 'host_down'
+    assert get_status(result('a', False, timed_out=True)) == 'timed_out'
+
+
+def test_diff_results_reports_only_changes():
+    previous = {'GLaDOS/a': 'success', 'GLaDOS/b': 'failure', 'GLaDOS/c': 'success'}
+    changes = diff_results(previous, [result('a'), result('b'), result('c', False), result('d')])
+    assert [(c['result']['account'], c['previous']) for c in changes] == [
+        ('b', 'failure'), ('c', 'success'), ('d', None)
+    ]
+
+
+@pytest.fixture
+def sent(tmp_path, monkeypatch):
+    """以 changes 模式运行，返回每次发送的标题列表"""
+    titles = []
+    config = {'key': 'k', 'mode': 'changes', 'digest_every': 3, 'state_path': str(tmp_path / 'notify.json')}
+    monkeypatch.setattr(notify, 'get_notify_config', lambda: config)
+    monkeypatch.setattr(notify, 'send_server_chan', lambda title, content, cfg: titles.append(title) or True)
+    return titles
+
+
+def test_changes_mode_sends_full_report_on_first_and_digest_runs(sent):
+    notify.send_notification([result('a'), result('b')])
+    notify.send_notification([result('a'), result('b')])
+    notify.send_notification([result('a'), result('b')])
+    assert len(sent) == 2
+    assert sent[0].startswith("🎯 自动签到报告")
+    assert sent[1].startswith("🎯 自动签到报告")
+
+
+def test_changes_mode_sends_change_report(sent):
+    notify.send_notification([result('a'), result('b')])
+    notify.send_notification([result('a', False), result('b')])
+    assert len(sent) == 2
+    assert "1 项变化" in sent[1]
+
+
+def test_failed_send_keeps_previous_state(sent, monkeypatch):
+    notify.send_notification([result('a')])
+    monkeypatch.setattr(notify, 'send_server_chan', lambda title, content, cfg: False)
+    notify.send_notification([result('a', False)])
+    monkeypatch.setattr(notify, 'send_server_chan', lambda title, content, cfg: sent.append(title) or True)
+    notify.send_notification([result('a', False)])
+    assert "1 项变化" in sent[-1]
+
+
+def test_change_content_tolerates_unknown_previous_status():
+    changes = diff_results({'GLaDOS/a': 'legacy'}, [result('a')])
+    content = notify.build_change_content([result('a')], changes)
+    assert "未知状态(legacy) → ✅ 成功" in content
@@ -0,0 +1,77 @@
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+import probe
+from probe import probe_host, format_probe, USER_AGENT
+
+
+@pytest.fixture
+def server():
+    """本地 HTTP 服务，HEAD 返回 handler.status，并记录收到的 UA"""
+    class Handler(BaseHTTPRequestHandler):
+        status = 200
+        user_agent = None
+
+        def do_HEAD(self):
+            Handler.user_agent = self.headers.get('user-agent')
+            self.send_response(Handler.status)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    httpd = HTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd, Handler
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_reachable_host(server):
+    httpd, handler = server
+    result = probe_host(f"http://127.0.0.1:{httpd.server_port}", timeout=5)
+    assert result['ok']
+    assert result['status'] == 200
+    assert {'dns', 'connect', 'http'} <= result.keys()
+    assert handler.user_agent == USER_AGENT
+    assert format_probe(result).startswith("✅")
+
+
+@pytest.mark.parametrize('status', [403, 405, 500])
+def test_non_gateway_status_is_up(server, status):
+    httpd, handler = server
+    handler.status = status
+    assert probe_host(f"http://127.0.0.1:{httpd.server_port}", timeout=5)['ok']
+
+
+@pytest.mark.parametrize('status', [502, 503, 504, 522])
+def test_gateway_error_is_down(server, status):
+    httpd, handler = server
+    handler.status = status
+    result = probe_host(f"http://127.0.0.1:{httpd.server_port}", timeout=5)
+    assert not result['ok']
+    assert result['error'] == f"HTTP {status}"
+
+
+def test_connection_refused_is_down():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    result = probe_host(f"http://127.0.0.1:{port}", timeout=2)
+    assert not result['ok']
+    assert 'connect' not in result
+    assert format_probe(result).startswith("🔌")
+
+
+def test_dns_timeout(monkeypatch):
+    monkeypatch.setattr(probe.socket, 'getaddrinfo', lambda *args, **kwargs: time.sleep(2))
+    start = time.monotonic()
+    result = probe_host("https://example.invalid", timeout=0.2)
+    assert time.monotonic() - start < 1
+    assert not result['ok']
+    assert result['error'] == "DNS 解析超时"